@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock
+import sys
+import os
+
+import pytest
+
+# Add the project root to the Python path to allow importing wcag_checker
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+# GUI modules replaced by mocks, since tkinter and PIL imports happen at the
+# top of wcag_checker
+MOCKED_GUI_MODULES = (
+    "tkinter",
+    "tkinter.ttk",
+    "tkinter.colorchooser",
+    "tkinter.filedialog",
+    "tkinter.messagebox",
+    "PIL.Image",
+    "PIL.ImageTk",
+)
+
+_gui_modules_patch = pytest.MonkeyPatch()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--all-combinations",
+        action="store_true",
+        default=False,
+        help="check random_colors over many seeds instead of a single one "
+        "(slow, intended for nightly runs)",
+    )
+
+
+def pytest_configure(config):
+    """Mocks the GUI modules once per session, before test modules import
+    wcag_checker during collection."""
+
+    for name in MOCKED_GUI_MODULES:
+        _gui_modules_patch.setitem(sys.modules, name, MagicMock())
+
+
+def pytest_unconfigure(config):
+    """Restores the original GUI modules at the end of the session."""
+
+    _gui_modules_patch.undo()
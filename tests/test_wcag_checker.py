@@ -1,161 +1,606 @@
-import unittest
-from unittest.mock import MagicMock, patch
+import random
 import re
-import colorsys
-import copy
-import sys
-import os
-
-# Add the project root to the Python path to allow importing wcag_checker
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, project_root)
-
-# Mock tkinter and its modules
-mock_tk = MagicMock()
-mock_ttk = MagicMock()
-mock_colorchooser = MagicMock()
-mock_filedialog = MagicMock()
-mock_messagebox = MagicMock()
-
-# Patch tkinter imports in the module being tested
-# This needs to be done before importing wcag_checker
-# since tkinter imports happen at the top of the file
-with patch.dict(
-    "sys.modules",
-    {
-        "tkinter": mock_tk,
-        "tkinter.ttk": mock_ttk,
-        "tkinter.colorchooser": mock_colorchooser,
-        "tkinter.filedialog": mock_filedialog,
-        "tkinter.messagebox": mock_messagebox,
-        "PIL.Image": MagicMock(),  # Mock PIL as well
-        "PIL.ImageDraw": MagicMock(),
-        "PIL.ImageTk": MagicMock(),
-    },
+import unittest.mock
+
+import pytest
+
+# The GUI modules are mocked by conftest.py before this import
+import wcag_checker
+from wcag_checker import WCAGCheckerApp
+
+
+class _StubRoot:
+    """Cheap stand-in for the Tk root: every attribute access and call
+    returns the stub itself, without MagicMock's call recording."""
+
+    def __getattr__(self, _name):
+        return self
+
+    def __call__(self, *_args, **_kwargs):
+        return self
+
+
+# Reference pattern, used to check is_valid_hex_color for equivalence
+_HEX_RE = re.compile(r"#[0-9a-fA-F]{6}\Z")
+
+# Seed used for the shared random_colors run, and the seeds checked when
+# running with --all-combinations
+RANDOM_COLORS_SEED = 1234
+ALL_COMBINATIONS_SEEDS = range(100)
+
+# Button states, collected once at import time to drive parametrization
+STATE_KEYS = [
+    state_key for state_key, _ in WCAGCheckerApp(_StubRoot()).button_state_definitions
+]
+
+
+@pytest.mark.parametrize(
+    "hex_string",
+    [
+        "#4682B4",
+        "#ffffff",
+        "#00aaFF",
+        "4682B4",
+        "#4682B",
+        "#4682B4\n",
+        "#4682G4",
+        "#+12345",
+        "#12_345",
+        "# 12345",
+        "#\u0661\u0662\u0663456",
+        "",
+    ],
+)
+def test_is_valid_hex_color_matches_regex(hex_string):
+    """Test that the hex validator agrees with the reference regex."""
+    expected = _HEX_RE.match(hex_string) is not None
+    assert wcag_checker.is_valid_hex_color(hex_string) == expected
+
+
+@pytest.mark.parametrize(
+    "color", [(0, 0, 0), (255, 255, 255), (10, 171, 254), (70, 130, 180)]
+)
+def test_rgb_to_hex_round_trip(color):
+    """Test that hex formatting matches str.format and parses back."""
+    hex_color = wcag_checker.rgb_to_hex(color)
+    assert hex_color == "#{:02X}{:02X}{:02X}".format(*color)
+    assert wcag_checker.hex_to_rgb(hex_color) == color
+
+
+def _srgb_luminance(color: tuple) -> float:
+    """Reference relative luminance, straight from the WCAG sRGB formula."""
+    linear = []
+    for c in color:
+        c = c / 255.0
+        linear.append(c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4)
+    return 0.2126 * linear[0] + 0.7152 * linear[1] + 0.0722 * linear[2]
+
+
+def test_calculate_luminance_matches_srgb_formula():
+    """Test that the table-driven luminance matches the sRGB formula."""
+    for c in range(256):
+        for color in ((c, c, c), (c, 255 - c, c // 2), (255, c, 0)):
+            assert wcag_checker.calculate_luminance(color) == _srgb_luminance(color)
+
+
+@pytest.mark.parametrize(
+    "target_hex, reference_hex, minimum_ratio",
+    [
+        ("#FFE7E7", "#F0F0F0", 3.0),
+        ("#DBEFFF", "#F0F0F0", 3.0),
+        ("#A0A0A0", "#4682B4", 4.5),
+        ("#1E466E", "#000000", 4.5),
+    ],
+)
+def test_adjust_color_for_contrast_crosses_to_feasible_side(
+    target_hex, reference_hex, minimum_ratio
 ):
-    # Import the application after mocking tkinter
-    from wcag_checker import WCAGCheckerApp, calculate_contrast_ratio
-
-
-class TestWCAGCheckerApp(unittest.TestCase):
-    def setUp(self):
-        # Create a dummy root for the app
-        self.mock_root = mock_tk.Tk()
-        self.app = WCAGCheckerApp(self.mock_root)
-        # Ensure the default colors are set as a baseline
-        self.app.restore_defaults()
-
-    def _is_hex_color(self, hex_string):
-        """Helper to check if a string is a valid hex color."""
-        return re.fullmatch(r"^#[0-9a-fA-F]{6}$", hex_string) is not None
-
-    def _rgb_to_hsl(self, rgb: tuple) -> tuple:
-        """Converts an RGB color tuple to an HSL tuple (hue, saturation, lightness)."""
-        _r, _g, _b = [c / 255.0 for c in rgb]
-        _h, _l, _s = colorsys.rgb_to_hls(_r, _g, _b)
-        return _h, _s, _l
-
-    def test_random_colors_execution(self):
-        """Test that random_colors runs without errors."""
-        try:
-            self.app.random_colors()
-        except Exception as e:
-            self.fail(f"random_colors raised an exception: {e}")
-
-    def test_random_colors_validity(self):
-        """Test that all generated colors are valid hex codes."""
-        self.app.random_colors()
-        for state_key, _ in self.app.button_state_definitions:
-            bg_color = self.app.state_color_settings[state_key]["background"]
-            fg_color = self.app.state_color_settings[state_key]["foreground"]
-            self.assertTrue(
-                self._is_hex_color(bg_color),
-                f"Invalid background color: {bg_color} for state {state_key}",
-            )
-            self.assertTrue(
-                self._is_hex_color(fg_color),
-                f"Invalid foreground color: {fg_color} for state {state_key}",
+    """Test that the adjustment moves toward the side that can comply, even
+    when that means passing the reference color's luminance."""
+    app = WCAGCheckerApp(_StubRoot())
+    reference_rgb = app.hex_to_rgb(reference_hex)
+    adjusted_rgb, ratio = app.adjust_color_for_contrast(
+        app.hex_to_rgb(target_hex), reference_rgb, minimum_ratio
+    )
+    assert ratio >= minimum_ratio
+    assert wcag_checker.calculate_contrast_ratio(adjusted_rgb, reference_rgb) == ratio
+
+
+def test_adjust_color_for_contrast_reaches_white_extreme():
+    """Test that full lightness converts to pure white, so the lighter side
+    counts as reachable only when white itself complies."""
+    app = WCAGCheckerApp(_StubRoot())
+    target_rgb, reference_rgb = (145, 233, 39), (182, 87, 123)
+    hue, saturation, _ = app._rgb_to_hsl(target_rgb)
+    assert app._hsl_to_rgb((hue, saturation, 1.0)) == (255, 255, 255)
+    adjusted_rgb, ratio = app.adjust_color_for_contrast(target_rgb, reference_rgb)
+    assert ratio >= 4.5
+    assert wcag_checker.calculate_contrast_ratio(adjusted_rgb, reference_rgb) == ratio
+
+
+def test_adjust_color_for_contrast_falls_back_to_other_side(monkeypatch):
+    """Test that when the chosen extreme misses the ratio, the other side is
+    used if it can comply."""
+    app = WCAGCheckerApp(_StubRoot())
+    hsl_to_rgb = app._hsl_to_rgb
+
+    def darker_white(hsl):
+        """Converts like _hsl_to_rgb, but never quite reaches white."""
+        return tuple(min(channel, 254) for channel in hsl_to_rgb(hsl))
+
+    monkeypatch.setattr(app, "_hsl_to_rgb", darker_white)
+    reference_rgb = (182, 87, 123)
+    adjusted_rgb, ratio = app.adjust_color_for_contrast((145, 233, 39), reference_rgb)
+    assert ratio >= 4.5
+    assert wcag_checker.calculate_luminance(
+        adjusted_rgb
+    ) < wcag_checker.calculate_luminance(reference_rgb)
+
+
+@pytest.mark.parametrize("display_width", [512, 600, 733])
+def test_palette_click_selects_swatch_under_pointer(display_width):
+    """Test that clicks map to the swatch drawn under the pointer, including
+    the first and last pixels of each swatch."""
+    app = WCAGCheckerApp(_StubRoot())
+    # The stub root reports itself as the focused widget
+    app.app_background_hex_entry = app.root.focus_get()
+    app.app_background_hex_var = unittest.mock.MagicMock()
+    app.update_app_background_from_hex_entry = lambda _event: None
+    app._palette_display_width = display_width
+    display_height = display_width * app.palette_height // app.palette_width
+
+    def pixel_span(cell, cells, size):
+        """First and last pixel of a cell, when size pixels hold cells."""
+        return -(-cell * size // cells), -(-(cell + 1) * size // cells) - 1
+
+    for index in (0, 31, 32, 100, len(app.balanced_colors) - 1):
+        row, col = divmod(index, app.SWATCH_COLUMNS)
+        xs = pixel_span(col, app.SWATCH_COLUMNS, display_width)
+        ys = pixel_span(row, app.palette_rows, display_height)
+        for x, y in zip(xs, ys):
+            app._on_palette_click(unittest.mock.Mock(x=x, y=y))
+            app.app_background_hex_var.set.assert_called_with(
+                app.balanced_colors[index]
             )
 
-    def test_random_colors_default_button_unchanged(self):
-        """Test that the default button's background remains unchanged."""
-        initial_default_bg = self.app.state_color_settings["default"]["background"]
-        self.app.random_colors()
-        final_default_bg = self.app.state_color_settings["default"]["background"]
-        self.assertEqual(
-            initial_default_bg,
-            final_default_bg,
-            "Default button background should not change after random_colors.",
+
+def test_palette_click_updates_focused_state_entry():
+    """Test that a click updates the state color entry holding the focus."""
+    app = WCAGCheckerApp(_StubRoot())
+    entry = unittest.mock.Mock()
+    app._color_entry_targets[entry] = ("hover", "foreground")
+    app.root = unittest.mock.Mock(**{"focus_get.return_value": entry})
+    app.state_ui_elements["hover"]["foreground_hex_var"] = unittest.mock.Mock()
+    app.update_color_from_hex_entry = unittest.mock.Mock()
+    app._on_palette_click(unittest.mock.Mock(x=0, y=0))
+    app.state_ui_elements["hover"]["foreground_hex_var"].set.assert_called_once_with(
+        app.balanced_colors[0]
+    )
+    app.update_color_from_hex_entry.assert_called_once_with("hover", "foreground")
+
+
+def test_palette_resize_reuses_recent_widths():
+    """Test that recently shown widths are not resampled again, and that the
+    cache drops the least recently shown width."""
+    app = WCAGCheckerApp(_StubRoot())
+    app.palette_image_pil = unittest.mock.MagicMock()
+    app.palette_image_label = unittest.mock.MagicMock()
+
+    def resize_to(width):
+        app.palette_image_label.winfo_width.return_value = width
+        app._do_resize_palette()
+
+    for width in (600, 700, 600):
+        resize_to(width)
+    assert app.palette_image_pil.resize.call_count == 2
+    for width in (800, 900, 1000, 1100):
+        resize_to(width)
+    assert app.palette_image_pil.resize.call_count == 6
+    assert list(app._resized_palette_cache) == [800, 900, 1000, 1100]
+    resize_to(600)
+    assert app.palette_image_pil.resize.call_count == 7
+
+
+@pytest.mark.parametrize(
+    "config_text",
+    [
+        "640x880+10+20\n",
+        "[WINDOW]\ngeometry = 640x880+10+20\n\n",
+    ],
+    ids=["plain", "legacy-ini"],
+)
+def test_load_window_geometry(tmp_path, monkeypatch, config_text):
+    """Test that the window geometry is read from plain and legacy files."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / wcag_checker.CONFIG_FILE).write_text(config_text)
+    app = WCAGCheckerApp(_StubRoot())
+    app.root = unittest.mock.MagicMock()
+    app.load_window_geometry()
+    app.root.geometry.assert_called_once_with("640x880+10+20")
+
+
+def test_compliance_display_skips_unchanged_labels():
+    """Test that a compliance label is only reconfigured when it changes."""
+    app = WCAGCheckerApp(_StubRoot())
+    label = unittest.mock.MagicMock()
+    app.update_compliance_display(label, True, 4.5)
+    app.update_compliance_display(label, True, 4.5)
+    assert label.config.call_count == 1
+    app.update_compliance_display(label, False, 4.0)
+    assert label.config.call_count == 2
+    # Clearing the labels on reset must force the next update through
+    app._compliance_label_state.clear()
+    app.update_compliance_display(label, False, 4.0)
+    assert label.config.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "background,foreground,expected_fixes",
+    [
+        ("#E6E6E6", "#FFFFFF", 3),
+        ("#E6E6E6", "#000000", 2),
+        ("#1E466E", "#5A96C8", 1),
+        ("#1E466E", "#FFFFFF", 0),
+    ],
+    ids=["refix-foreground", "background-only", "foreground-only", "compliant"],
+)
+def test_fix_colors_for_state_writes_back_compliant_colors(
+    background, foreground, expected_fixes
+):
+    """Test that a corrected state is compliant and its RGB mirror in sync."""
+    app = WCAGCheckerApp(_StubRoot())
+    app._set_state_color("hover", "background", background)
+    app._set_state_color("hover", "foreground", foreground)
+    assert app._fix_colors_for_state("hover") == expected_fixes
+    colors_rgb = app.state_color_rgb["hover"]
+    assert colors_rgb == {
+        color_type: app.hex_to_rgb(hex_color)
+        for color_type, hex_color in app.state_color_settings["hover"].items()
+    }
+    app_background_rgb = app.hex_to_rgb(app.app_background_color)
+    assert app.check_contrast_compliance(
+        colors_rgb["foreground"], colors_rgb["background"], ""
+    )[0]
+    assert app.check_contrast_compliance(
+        app_background_rgb, colors_rgb["background"], ""
+    )[0]
+
+
+@pytest.fixture
+def display_mocked_app():
+    """Builds an app whose per-state hex variables and preview buttons are
+    mocks, after the initial refresh has shown the current colors."""
+    app = WCAGCheckerApp(_StubRoot())
+    app._state_display_widgets = {
+        state_key: (
+            unittest.mock.MagicMock(),
+            unittest.mock.MagicMock(),
+            unittest.mock.MagicMock(),
         )
+        for state_key in app._state_display_widgets
+    }
+    return app
+
+
+def test_select_button_color_refreshes_only_its_state(monkeypatch, display_mocked_app):
+    """Test that picking a state color reconfigures only that state."""
+    app = display_mocked_app
+    monkeypatch.setattr(
+        wcag_checker.colorchooser,
+        "askcolor",
+        unittest.mock.MagicMock(return_value=((0, 0, 0), "#000000")),
+    )
+    app.select_button_color("hover", "foreground")
+    assert app.state_color_rgb["hover"]["foreground"] == (0, 0, 0)
+    for state_key, (
+        _,
+        foreground_hex_var,
+        preview_button,
+    ) in app._state_display_widgets.items():
+        if state_key == "hover":
+            foreground_hex_var.set.assert_called_once_with("#000000")
+            assert preview_button.configure.call_count == 1
+        else:
+            foreground_hex_var.set.assert_not_called()
+            preview_button.configure.assert_not_called()
+
+
+def test_select_app_background_updates_all_indicators(monkeypatch):
+    """Test that picking the app background updates every compliance label,
+    like typing it into its entry does."""
+    app = WCAGCheckerApp(_StubRoot())
+    monkeypatch.setattr(
+        wcag_checker.colorchooser,
+        "askcolor",
+        unittest.mock.MagicMock(return_value=((0, 0, 0), "#000000")),
+    )
+    update_state_compliance = unittest.mock.Mock(return_value=True)
+    monkeypatch.setattr(app, "_update_state_compliance", update_state_compliance)
+    app.select_app_background()
+    assert app.app_background_rgb == (0, 0, 0)
+    assert [call.args for call in update_state_compliance.call_args_list] == [
+        (state_key, (0, 0, 0)) for state_key in STATE_KEYS
+    ]
+
+
+def test_refresh_skips_unchanged_preview_colors(display_mocked_app):
+    """Test that a full refresh only reconfigures changed preview buttons,
+    while still resetting every hex entry."""
+    app = display_mocked_app
+    app.preview_display_frame = unittest.mock.MagicMock()
+    app._set_state_color("active", "background", "#000000")
+    app.refresh_all_displays()
+    app.preview_display_frame.configure.assert_not_called()
+    for state_key, (
+        background_hex_var,
+        _,
+        preview_button,
+    ) in app._state_display_widgets.items():
+        background_hex_var.set.assert_called_once()
+        assert preview_button.configure.call_count == (state_key == "active")
+
+
+def test_app_background_entry_updates_rgb_mirror():
+    """Test that a new application background is parsed into its mirror."""
+    app = WCAGCheckerApp(_StubRoot())
+    app.app_background_hex_var = unittest.mock.Mock(**{"get.return_value": "#102030"})
+    app.update_app_background_from_hex_entry(None)
+    assert app.app_background_color == "#102030"
+    assert app.app_background_rgb == (0x10, 0x20, 0x30)
+
+
+def _load_settings_file(app, tmp_path, monkeypatch, settings):
+    """Loads settings through load_settings, with the dialogs mocked, and
+    returns the mocked messagebox."""
+    settings_file = tmp_path / "settings.json"
+    with open(settings_file, "wb") as f:
+        wcag_checker.dump_json(settings, f)
+    monkeypatch.setattr(
+        wcag_checker.filedialog,
+        "askopenfilename",
+        unittest.mock.Mock(return_value=str(settings_file)),
+    )
+    messagebox = unittest.mock.Mock()
+    monkeypatch.setattr(wcag_checker, "messagebox", messagebox)
+    app.load_settings()
+    return messagebox
+
+
+@pytest.mark.parametrize(
+    "app_background_color,state_key,state_colors",
+    [
+        ("#GGGGGG", "hover", {"background": "#4682B4", "foreground": "#FFFFFF"}),
+        ("#FFFFFF", "hover", {"background": "4682B4", "foreground": "#FFFFFF"}),
+        ("#FFFFFF", "active", {"background": "#1E466E", "foreground": 255}),
+        ("#FFFFFF", "disabled", "#BED2E6 background foreground"),
+    ],
+    ids=["app-background", "missing-hash", "not-a-string", "not-a-dict"],
+)
+def test_load_settings_rejects_invalid_colors(
+    tmp_path, monkeypatch, app_background_color, state_key, state_colors
+):
+    """Test that a file with an invalid color is rejected before any of its
+    colors replace the current ones."""
+    app = WCAGCheckerApp(_StubRoot())
+    settings = {
+        "app_background_color": app_background_color,
+        "state_color_settings": app._copy_state_color_settings(
+            app.state_color_settings
+        ),
+    }
+    settings["state_color_settings"]["default"]["background"] = "#000000"
+    settings["state_color_settings"][state_key] = state_colors
+
+    app_background_color = app.app_background_color
+    app_background_rgb = app.app_background_rgb
+    state_color_settings = app._copy_state_color_settings(app.state_color_settings)
+    state_color_rgb = app._copy_state_color_settings(app.state_color_rgb)
+    messagebox = _load_settings_file(app, tmp_path, monkeypatch, settings)
+
+    assert messagebox.showerror.call_args.args[0] == "Invalid File"
+    assert app.app_background_color == app_background_color
+    assert app.app_background_rgb == app_background_rgb
+    assert app.state_color_settings == state_color_settings
+    assert app.state_color_rgb == state_color_rgb
+    assert app.restore_state_color_settings == state_color_settings
+
+
+def test_load_settings_ignores_unknown_states(tmp_path, monkeypatch):
+    """Test that entries for states the app does not know are ignored."""
+    app = WCAGCheckerApp(_StubRoot())
+    state_color_settings = app._copy_state_color_settings(app.state_color_settings)
+    state_color_settings["hover"]["background"] = "#000000"
+    settings = {
+        "app_background_color": "#FFFFFF",
+        "state_color_settings": {**state_color_settings, "pressed": {"note": "x"}},
+    }
+    messagebox = _load_settings_file(app, tmp_path, monkeypatch, settings)
+
+    messagebox.showerror.assert_not_called()
+    assert app.app_background_rgb == (255, 255, 255)
+    assert app.state_color_settings == state_color_settings
+    assert app.state_color_rgb["hover"]["background"] == (0, 0, 0)
+    assert app.restore_state_color_settings == state_color_settings
+
+
+def test_set_color_settings_parses_before_replacing():
+    """Test that an invalid application background leaves the state colors
+    and their mirror untouched."""
+    app = WCAGCheckerApp(_StubRoot())
+    state_settings = app._copy_state_color_settings(app.state_color_settings)
+    state_settings["hover"]["background"] = "#000000"
+    state_color_rgb = app.state_color_rgb
+    with pytest.raises(ValueError):
+        app._set_color_settings("#GGGGGG", state_settings)
+    assert app.state_color_settings["hover"]["background"] != "#000000"
+    assert app.state_color_rgb is state_color_rgb
+    assert app.app_background_rgb == app.hex_to_rgb(app.app_background_color)
 
-    def test_random_colors_compliance(self):
-        """Test that generated colors meet WCAG contrast requirements."""
-        self.app.random_colors()
-        app_bg_rgb = self.app.hex_to_rgb(self.app.app_background_color)
-        min_contrast_button_bg_vs_app_bg = 3.0
-        # Relaxed test requirement to WCAG AA normal text
-        min_contrast_button_bg_vs_button_fg = 4.5
-
-        for state_key, _ in self.app.button_state_definitions:
-            bg_hex = self.app.state_color_settings[state_key]["background"]
-            fg_hex = self.app.state_color_settings[state_key]["foreground"]
-
-            bg_rgb = self.app.hex_to_rgb(bg_hex)
-            fg_rgb = self.app.hex_to_rgb(fg_hex)
-
-            # Test button background against app background
-            contrast_bg_vs_app_bg = calculate_contrast_ratio(bg_rgb, app_bg_rgb)
-            self.assertGreaterEqual(
-                contrast_bg_vs_app_bg,
-                min_contrast_button_bg_vs_app_bg,
-                f"Background contrast for {state_key} ({bg_hex} vs App BG {self.app.app_background_color}) "
-                f"is {contrast_bg_vs_app_bg:.2f}:1, expected >= {min_contrast_button_bg_vs_app_bg}:1",
-            )
 
-            # Test foreground against button background, ONLY for non-default states
-            if state_key != "default":
-                contrast_fg_vs_bg = calculate_contrast_ratio(fg_rgb, bg_rgb)
-                self.assertGreaterEqual(
-                    contrast_fg_vs_bg,
-                    min_contrast_button_bg_vs_button_fg,
-                    f"Foreground contrast for {state_key} ({fg_hex} vs BG {bg_hex}) "
-                    f"is {contrast_fg_vs_bg:.2f}:1, expected >= {min_contrast_button_bg_vs_button_fg}:1",
-                )
-
-    def test_random_colors_distinctness(self):
-        """
-        Test that colors for non-default states are distinct from the default
-        and vary from each other (probabilistically).
-        """
-        initial_colors = copy.deepcopy(self.app.state_color_settings)
-        self.app.random_colors()
-        generated_colors = self.app.state_color_settings
-
-        # Default button background should be the same
-        self.assertEqual(
-            initial_colors["default"]["background"],
-            generated_colors["default"]["background"],
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_settings_json_round_trip(tmp_path, monkeypatch, use_orjson):
+    """Test that settings survive a save and load with either JSON backend."""
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(wcag_checker, "orjson", None)
+    app = WCAGCheckerApp(_StubRoot())
+    settings = {
+        "app_background_color": app.app_background_color,
+        "state_color_settings": app.state_color_settings,
+    }
+    settings_file = tmp_path / "settings.json"
+    with open(settings_file, "wb") as f:
+        wcag_checker.dump_json(settings, f)
+    with open(settings_file, "rb") as f:
+        assert wcag_checker.load_json(f) == settings
+
+
+def pytest_generate_tests(metafunc):
+    if "random_colors_seed" in metafunc.fixturenames:
+        if metafunc.config.getoption("all_combinations"):
+            seeds = ALL_COMBINATIONS_SEEDS
+        else:
+            seeds = [RANDOM_COLORS_SEED]
+        metafunc.parametrize(
+            "random_colors_seed",
+            seeds,
+            scope="module",
+            ids=[f"seed{seed}" for seed in seeds],
+        )
+
+
+@pytest.fixture(scope="module")
+def randomized_app(random_colors_seed):
+    """Runs random_colors once per seed and shares the result with all tests."""
+    app = WCAGCheckerApp(_StubRoot())
+    # Ensure the default colors are set as a baseline
+    app.restore_defaults()
+    # Leaf values are immutable strings, so a two-level copy is enough
+    initial_colors = {k: dict(v) for k, v in app.state_color_settings.items()}
+    # Seed the generator so every run checks the same colors, and leave the
+    # global random state as it was for other tests
+    random_state = random.getstate()
+    random.seed(random_colors_seed)
+    try:
+        app.random_colors()
+    finally:
+        random.setstate(random_state)
+    return app, initial_colors
+
+
+def test_random_colors_execution(randomized_app):
+    """Test that random_colors runs without errors."""
+    app, _ = randomized_app
+    assert set(app.state_color_settings) == set(STATE_KEYS)
+
+
+@pytest.mark.parametrize("state_key", STATE_KEYS)
+def test_random_colors_validity(randomized_app, state_key):
+    """Test that all generated colors are valid hex codes."""
+    app, _ = randomized_app
+    colors = app.state_color_settings[state_key]
+    bg_color = colors["background"]
+    fg_color = colors["foreground"]
+    assert wcag_checker.is_valid_hex_color(
+        bg_color
+    ), f"Invalid background color: {bg_color} for state {state_key}"
+    assert wcag_checker.is_valid_hex_color(
+        fg_color
+    ), f"Invalid foreground color: {fg_color} for state {state_key}"
+
+
+def test_random_colors_rgb_mirror_in_sync(randomized_app):
+    """Test that the parsed RGB mirror matches the stored hex colors."""
+    app, _ = randomized_app
+    assert app.app_background_rgb == app.hex_to_rgb(app.app_background_color)
+    for state_key, colors in app.state_color_settings.items():
+        for color_type, hex_color in colors.items():
+            assert app.state_color_rgb[state_key][color_type] == app.hex_to_rgb(
+                hex_color
+            ), f"Stale RGB mirror for {state_key} {color_type}"
+
+
+def test_random_colors_default_button_unchanged(randomized_app):
+    """Test that the default button's background remains unchanged."""
+    app, initial_colors = randomized_app
+    initial_default_bg = initial_colors["default"]["background"]
+    final_default_bg = app.state_color_settings["default"]["background"]
+    assert (
+        initial_default_bg == final_default_bg
+    ), "Default button background should not change after random_colors."
+
+
+@pytest.fixture(scope="module")
+def randomized_contrasts(randomized_app):
+    """Computes the contrast ratios of all button states in a single pass."""
+    app, _ = randomized_app
+    contrast_ratio = wcag_checker.calculate_contrast_ratio
+    hex_to_rgb = app.hex_to_rgb
+    app_bg_rgb = hex_to_rgb(app.app_background_color)
+
+    contrasts = {}
+    for state_key, colors in app.state_color_settings.items():
+        bg_rgb = hex_to_rgb(colors["background"])
+        fg_rgb = hex_to_rgb(colors["foreground"])
+        contrasts[state_key] = (
+            contrast_ratio(bg_rgb, app_bg_rgb),
+            contrast_ratio(fg_rgb, bg_rgb),
         )
+    return contrasts
+
 
-        # Other states should ideally change
-        changed_count = 0
-        for state_key in self.app.state_descriptions:
-            if state_key != "default":
-                if (
-                    initial_colors[state_key]["background"]
-                    != generated_colors[state_key]["background"]
-                    or initial_colors[state_key]["foreground"]
-                    != generated_colors[state_key]["foreground"]
-                ):
-                    changed_count += 1
-        # Expect at least most colors to change, but not necessarily all due to randomness
-        # This is a probabilistic test, so it might fail rarely.
-        self.assertGreater(
-            changed_count,
-            len(self.app.button_state_definitions) - 2,
-            "Most random colors for non-default states should change.",
+@pytest.mark.parametrize("state_key", STATE_KEYS)
+def test_random_colors_compliance(randomized_app, randomized_contrasts, state_key):
+    """Test that generated colors meet WCAG contrast requirements."""
+    app, _ = randomized_app
+    min_contrast_button_bg_vs_app_bg = 3.0
+    # Relaxed test requirement to WCAG AA normal text
+    min_contrast_button_bg_vs_button_fg = 4.5
+
+    colors = app.state_color_settings[state_key]
+    bg_hex = colors["background"]
+    fg_hex = colors["foreground"]
+    contrast_bg_vs_app_bg, contrast_fg_vs_bg = randomized_contrasts[state_key]
+
+    # Test button background against app background
+    assert contrast_bg_vs_app_bg >= min_contrast_button_bg_vs_app_bg, (
+        f"Background contrast for {state_key} ({bg_hex} vs App BG {app.app_background_color}) "
+        f"is {contrast_bg_vs_app_bg:.2f}:1, expected >= {min_contrast_button_bg_vs_app_bg}:1"
+    )
+
+    # Test foreground against button background, ONLY for non-default states
+    if state_key != "default":
+        assert contrast_fg_vs_bg >= min_contrast_button_bg_vs_button_fg, (
+            f"Foreground contrast for {state_key} ({fg_hex} vs BG {bg_hex}) "
+            f"is {contrast_fg_vs_bg:.2f}:1, expected >= {min_contrast_button_bg_vs_button_fg}:1"
         )
 
 
-if __name__ == "__main__":
-    unittest.main()
+def test_random_colors_distinctness(randomized_app):
+    """
+    Test that colors for non-default states are distinct from the default
+    and vary from each other. The random_colors run is seeded, so the
+    outcome is deterministic.
+    """
+    app, initial_colors = randomized_app
+    generated_colors = app.state_color_settings
+
+    # Default button background should be the same
+    assert (
+        initial_colors["default"]["background"]
+        == generated_colors["default"]["background"]
+    )
+
+    # Other states should change
+    changed_count = sum(
+        initial_colors[state_key]["background"] != generated["background"]
+        or initial_colors[state_key]["foreground"] != generated["foreground"]
+        for state_key, generated in generated_colors.items()
+        if state_key != "default"
+    )
+    # Random generation could in principle reproduce an initial color, but
+    # with a fixed seed this either always passes or always fails
+    assert (
+        changed_count > len(app.button_state_definitions) - 2
+    ), "Most random colors for non-default states should change."
@@ -10,37 +10,88 @@ compliance, and automatically correct non-compliant colors.
 Author: Gino Bogo
 """
 
-import configparser as cfg
-import copy
 import json
+import math
 import os
 import random
 import colorsys
 import tkinter as tk
-from tkinter import colorchooser, filedialog, messagebox, ttk
-from typing import Tuple, cast
+from collections import OrderedDict
+from functools import lru_cache
+from tkinter import colorchooser, filedialog, font, messagebox, ttk
+from typing import Tuple
 
-from PIL import Image, ImageDraw, ImageTk
+from PIL import Image, ImageTk
+
+try:
+    import orjson
+except ImportError:  # Optional, for faster settings I/O
+    orjson = None
 
 CONFIG_FILE = "wcag_checker.cfg"
 FRAME_PADDING = 10  # Padding used in main_frame and controls_frame
 
+# Descriptions of the named fonts shared by the widgets
+HEADING_FONT = ("Arial", 12, "bold")
+PREVIEW_BUTTON_FONT = ("Arial", 11)
+HEX_ENTRY_FONT = ("Courier", 10)
+COMPLIANCE_FONT = ("Courier", 10, "bold")
+
+WHITE_RGB = (255, 255, 255)
+BLACK_RGB = (0, 0, 0)
+
+# Background luminance at which white and black text contrast equally:
+# 1.05 / (L + 0.05) == (L + 0.05) / 0.05
+BLACK_WHITE_CROSSOVER_LUMINANCE = 0.0525**0.5 - 0.05
+
+
+# =============================================================================
+# SETTINGS FILE I/O
+# =============================================================================
+
+
+def load_json(file) -> object:
+    """Loads JSON from a file opened in binary mode, with orjson if available."""
+
+    if orjson is not None:
+        return orjson.loads(file.read())
+    return json.load(file)
+
+
+def dump_json(data: object, file) -> None:
+    """Dumps JSON to a file opened in binary mode, with orjson if available."""
+
+    if orjson is not None:
+        file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        file.write(json.dumps(data, indent=4).encode("utf-8"))
+
 
 # =============================================================================
 # CORE WCAG COMPLIANCE FUNCTIONS
 # =============================================================================
 
 
+# sRGB to linear light conversion for each of the 256 channel values
+_SRGB_LUT = tuple(
+    (
+        (c / 255.0) / 12.92
+        if c / 255.0 <= 0.03928
+        else ((c / 255.0 + 0.055) / 1.055) ** 2.4
+    )
+    for c in range(256)
+)
+
+
+@lru_cache(maxsize=1024)
 def calculate_luminance(color: Tuple[int, int, int]) -> float:
     """Calculates the relative luminance of an RGB color."""
 
-    r, g, b = [c / 255.0 for c in color]
-    r = r / 12.92 if r <= 0.03928 else ((r + 0.055) / 1.055) ** 2.4
-    g = g / 12.92 if g <= 0.03928 else ((g + 0.055) / 1.055) ** 2.4
-    b = b / 12.92 if b <= 0.03928 else ((b + 0.055) / 1.055) ** 2.4
-    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+    r, g, b = color
+    return 0.2126 * _SRGB_LUT[r] + 0.7152 * _SRGB_LUT[g] + 0.0722 * _SRGB_LUT[b]
 
 
+@lru_cache(maxsize=1024)
 def calculate_contrast_ratio(
     foreground: Tuple[int, int, int], background: Tuple[int, int, int]
 ) -> float:
@@ -51,6 +102,15 @@ def calculate_contrast_ratio(
     return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
 
 
+# Minimum contrast ratios by WCAG level and text size
+_WCAG_THRESHOLDS = {
+    ("AA", "normal"): 4.5,
+    ("AA", "large"): 3.0,
+    ("AAA", "normal"): 7.0,
+    ("AAA", "large"): 4.5,
+}
+
+
 def is_compliant(
     foreground: Tuple[int, int, int],
     background: Tuple[int, int, int],
@@ -59,18 +119,60 @@ def is_compliant(
 ) -> bool:
     """Checks if a color combination meets a WCAG compliance level."""
 
-    contrast_ratio = calculate_contrast_ratio(foreground, background)
+    return (
+        calculate_contrast_ratio(foreground, background)
+        >= _WCAG_THRESHOLDS[level, size]
+    )
 
-    if level == "AA":
-        if size == "normal":
-            return contrast_ratio >= 4.5
-        else:
-            return contrast_ratio >= 3.0
+
+# Digits allowed after the '#' of a hex color
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def is_valid_hex_color(hex_string: str) -> bool:
+    """Checks if a string is a '#RRGGBB' hex color, without raising."""
+
+    return (
+        len(hex_string) == 7
+        and hex_string[0] == "#"
+        and _HEX_DIGITS.issuperset(hex_string[1:])
+    )
+
+
+@lru_cache(maxsize=1024)
+def hex_to_rgb(hex_string: str) -> Tuple[int, int, int]:
+    """Converts a hex color string to an RGB tuple; the few colors in use
+    are parsed once."""
+
+    # Well-formed "#RRGGBB" strings skip the strip and lstrip copies
+    if len(hex_string) == 7 and hex_string[0] == "#":
+        color_string = hex_string[1:]
     else:
-        if size == "normal":
-            return contrast_ratio >= 7.0
-        else:
-            return contrast_ratio >= 4.5
+        color_string = hex_string.strip().lstrip("#")
+
+    if len(color_string) != 6:
+        raise ValueError(f"Invalid hex color length: {hex_string}")
+
+    # A single C-level parse; with exactly 6 characters any whitespace
+    # leaves an odd digit count, so only plain hex digits get through
+    try:
+        red, green, blue = bytes.fromhex(color_string)
+    except ValueError:
+        raise ValueError(f"Invalid hex color value: {hex_string}")
+    return red, green, blue
+
+
+# Two-digit uppercase hex string for each of the 256 channel values
+_HEX_BYTES = tuple(f"{value:02X}" for value in range(256))
+
+
+@lru_cache(maxsize=1024)
+def rgb_to_hex(color: Tuple[int, int, int]) -> str:
+    """Converts an RGB color tuple to a hex string; corrections tend to
+    converge on a few colors, which are formatted once."""
+
+    red, green, blue = color
+    return "#" + _HEX_BYTES[red] + _HEX_BYTES[green] + _HEX_BYTES[blue]
 
 
 # =============================================================================
@@ -104,14 +206,16 @@ class WCAGCheckerApp:
     def _initialize_application_state(self):
         """Initializes the application state variables and default settings."""
 
-        self.button_state_definitions = [
+        self.button_state_definitions = (
             ("default", "Button Default"),
             ("hover", "Button Hover"),
             ("focused", "Button Focused"),
             ("active", "Button Active"),
             ("disabled", "Button Disabled"),
-        ]
+        )
         self.state_descriptions = dict(self.button_state_definitions)
+        # State keys alone, for the loops that do not need the descriptions
+        self._state_keys = tuple(self.state_descriptions)
 
         self.default_app_background_color = "#F0F0F0"
         self.default_state_color_settings = {
@@ -122,20 +226,43 @@ class WCAGCheckerApp:
             "disabled": {"background": "#BED2E6", "foreground": "#696969"},
         }
 
-        self.app_background_color = self.default_app_background_color
-        self.state_color_settings = copy.deepcopy(self.default_state_color_settings)
+        # Random HSL transformation ranges applied to the default button
+        # color for the other states, as (hue shift, saturation multiplier,
+        # lightness shift) ranges
+        self.random_state_transform_ranges = {
+            "hover": ((0.02, 0.08), (1.1, 1.4), (-0.20, -0.08)),
+            "focused": ((0.05, 0.12), (1.05, 1.25), (0.15, 0.30)),
+            "active": ((-0.15, -0.05), (1.2, 1.5), (-0.35, -0.15)),
+            "disabled": ((-0.05, 0.05), (0.2, 0.4), (0.25, 0.45)),
+        }
+
+        self._set_color_settings(
+            self.default_app_background_color,
+            self._copy_state_color_settings(self.default_state_color_settings),
+        )
 
         self.restore_app_background_color = self.default_app_background_color
-        self.restore_state_color_settings = copy.deepcopy(
+        self.restore_state_color_settings = self._copy_state_color_settings(
             self.default_state_color_settings
         )
 
         self.state_ui_elements = {}
-        self._resizing = False
+        # (text, foreground) last shown by each compliance label
+        self._compliance_label_state = {}
+        # Colors last shown by the preview area, by state key, with None for
+        # the application background
+        self._preview_colors_shown = {}
+        # (state_key, color_type) edited by each state color entry widget
+        self._color_entry_targets = {}
+        self._resize_after_id = None
+        # Resized palette PhotoImages by width, least recently shown first
+        self._resized_palette_cache = OrderedDict()
         self._file_loaded = False
 
         self.SWATCH_COLUMNS = 32
         self.SWATCH_WIDTH = 16
+        self.RESIZE_DELAY_MS = 50
+        self.RESIZE_CACHE_SIZE = 4
 
     def _initialize_color_palette(self):
         """Initializes the color palette with balanced colors."""
@@ -185,6 +312,19 @@ class WCAGCheckerApp:
         ]
         # fmt: on
 
+        # Parse the palette once, so drawing and lookups work on RGB tuples
+        self.balanced_colors_rgb = tuple(map(self.hex_to_rgb, self.balanced_colors))
+
+        # Palette image layout, fixed for the lifetime of the application
+        self.palette_rows = (
+            len(self.balanced_colors) + self.SWATCH_COLUMNS - 1
+        ) // self.SWATCH_COLUMNS
+        self.palette_width = self.SWATCH_COLUMNS * self.SWATCH_WIDTH
+        self.palette_height = self.palette_rows * self.SWATCH_WIDTH
+        # Width of the palette image currently shown, which resizes keep in
+        # step with the label up to a few pixels
+        self._palette_display_width = self.palette_width
+
     # =========================================================================
     # WINDOW AND CONFIGURATION MANAGEMENT
     # =========================================================================
@@ -198,21 +338,24 @@ class WCAGCheckerApp:
     def load_window_geometry(self):
         """Loads the window geometry from a config file if it exists."""
 
-        config = cfg.ConfigParser()
-        if os.path.exists(CONFIG_FILE):
-            config.read(CONFIG_FILE)
-            if "WINDOW" in config and "geometry" in config["WINDOW"]:
-                self.root.geometry(config["WINDOW"]["geometry"])
+        if not os.path.exists(CONFIG_FILE):
+            return
+
+        with open(CONFIG_FILE, "r") as configfile:
+            lines = [line.strip() for line in configfile if line.strip()]
+
+        # The geometry is the last line; files from older versions are INI
+        # files ending with a "geometry = ..." line under [WINDOW]
+        if lines:
+            geometry = lines[-1].rpartition("=")[2].strip()
+            if geometry:
+                self.root.geometry(geometry)
 
     def save_window_geometry(self):
         """Saves the current window geometry to a config file."""
 
-        config = cfg.ConfigParser()
-        config["WINDOW"] = {
-            "geometry": self.root.geometry(),
-        }
         with open(CONFIG_FILE, "w") as configfile:
-            config.write(configfile)
+            configfile.write(self.root.geometry() + "\n")
 
     def load_settings(self):
         """Loads color settings from a file."""
@@ -226,8 +369,8 @@ class WCAGCheckerApp:
             return
 
         try:
-            with open(filepath, "r") as f:
-                settings = json.load(f)
+            with open(filepath, "rb") as f:
+                settings = load_json(f)
 
             # Robust validation
             if not isinstance(settings, dict):
@@ -242,23 +385,39 @@ class WCAGCheckerApp:
             if not isinstance(settings["state_color_settings"], dict):
                 raise ValueError("'state_color_settings' should be a dictionary.")
 
-            for state_key, _ in self.button_state_definitions:
-                if state_key not in settings["state_color_settings"]:
+            # Only the known states are read; any other entries are ignored
+            state_settings = {}
+            for state_key in self._state_keys:
+                colors = settings["state_color_settings"].get(state_key)
+                if colors is None:
                     raise ValueError(f"Missing settings for state: {state_key}")
                 if (
-                    "background" not in settings["state_color_settings"][state_key]
-                    or "foreground" not in settings["state_color_settings"][state_key]
+                    not isinstance(colors, dict)
+                    or "background" not in colors
+                    or "foreground" not in colors
                 ):
                     raise ValueError(
                         f"Missing 'background' or 'foreground' for state: {state_key}"
                     )
-
-            self.app_background_color = settings["app_background_color"]
-            self.state_color_settings = settings["state_color_settings"]
+                state_settings[state_key] = {
+                    "background": colors["background"],
+                    "foreground": colors["foreground"],
+                }
+
+            # Check the colors with the same validator as the hex entries,
+            # since hex_to_rgb also accepts forms Tk cannot display
+            loaded_colors = [settings["app_background_color"]]
+            for colors in state_settings.values():
+                loaded_colors += colors.values()
+            for color in loaded_colors:
+                if not (isinstance(color, str) and is_valid_hex_color(color)):
+                    raise ValueError(f"Invalid hex color: {color!r}")
+
+            self._set_color_settings(settings["app_background_color"], state_settings)
 
             self.restore_app_background_color = settings["app_background_color"]
-            self.restore_state_color_settings = copy.deepcopy(
-                settings["state_color_settings"]
+            self.restore_state_color_settings = self._copy_state_color_settings(
+                state_settings
             )
 
             self._file_loaded = True
@@ -292,8 +451,8 @@ class WCAGCheckerApp:
             return
 
         try:
-            with open(filepath, "w") as f:
-                json.dump(settings, f, indent=4)
+            with open(filepath, "wb") as f:
+                dump_json(settings, f)
             messagebox.showinfo("Save Complete", f"Settings saved to {filepath}")
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save settings: {e}")
@@ -305,6 +464,7 @@ class WCAGCheckerApp:
     def initialize_ui(self):
         """Sets up the main UI components by calling helper methods."""
 
+        self._create_fonts()
         main_frame = self._create_main_frames()
         controls_frame = self._create_controls_frame(main_frame)
         self._create_color_palette_widgets(controls_frame)
@@ -315,6 +475,35 @@ class WCAGCheckerApp:
         button_controls_frame_main.grid(row=2, column=0, sticky=tk.E + tk.W)
         self._create_control_buttons(button_controls_frame_main)
 
+        # Per-state widgets in state order, unpacked by the refresh methods
+        # instead of going through the nested widget dicts
+        self._state_display_widgets = {
+            state_key: (
+                self.state_ui_elements[state_key]["background_hex_var"],
+                self.state_ui_elements[state_key]["foreground_hex_var"],
+                self.preview_button_elements[state_key],
+            )
+            for state_key in self._state_keys
+        }
+        self._state_compliance_widgets = {
+            state_key: (
+                f"{description} Button",
+                f"App BG vs {description} Button BG",
+                self.state_ui_elements[state_key]["foreground_compliance_label"],
+                self.state_ui_elements[state_key]["background_compliance_label"],
+            )
+            for state_key, description in self.button_state_definitions
+        }
+
+    def _create_fonts(self):
+        """Creates the named fonts once, so that Tk resolves each font a
+        single time instead of once per widget."""
+
+        self.heading_font = font.Font(root=self.root, font=HEADING_FONT)
+        self.preview_button_font = font.Font(root=self.root, font=PREVIEW_BUTTON_FONT)
+        self.hex_entry_font = font.Font(root=self.root, font=HEX_ENTRY_FONT)
+        self.compliance_font = font.Font(root=self.root, font=COMPLIANCE_FONT)
+
     def _create_main_frames(self):
         """Creates and configures the main application frames."""
 
@@ -349,7 +538,7 @@ class WCAGCheckerApp:
     def _create_color_palette_widgets(self, parent):
         """Creates the widgets for the color palette selection."""
 
-        ttk.Label(parent, text="Color Palette", font=("Arial", 12, "bold")).grid(
+        ttk.Label(parent, text="Color Palette", font=self.heading_font).grid(
             row=0, column=0, sticky=tk.W, pady=(0, 5)
         )
 
@@ -364,7 +553,7 @@ class WCAGCheckerApp:
         self.palette_image_label.bind("<Configure>", self._resize_palette_image)
         self.palette_image_label.bind("<Button-1>", self._on_palette_click)
 
-        ttk.Label(parent, text="Color Selection", font=("Arial", 12, "bold")).grid(
+        ttk.Label(parent, text="Color Selection", font=self.heading_font).grid(
             row=2, column=0, sticky=tk.W, pady=(0, 5)
         )
         color_selection_frame = ttk.LabelFrame(parent, padding="10")
@@ -407,7 +596,7 @@ class WCAGCheckerApp:
         self.app_background_hex_entry = ttk.Entry(
             color_selection_frame,
             textvariable=self.app_background_hex_var,
-            font=("Courier", 10),
+            font=self.hex_entry_font,
             width=10,
             justify=tk.CENTER,
         )
@@ -421,7 +610,7 @@ class WCAGCheckerApp:
         self.app_background_compliance_label = ttk.Label(
             color_selection_frame,
             text="",
-            font=("Courier", 10, "bold"),
+            font=self.compliance_font,
             anchor="center",
         )
         self.app_background_compliance_label.grid(row=1, column=5, sticky=tk.W, padx=5)
@@ -437,49 +626,31 @@ class WCAGCheckerApp:
         """Creates a single row of color selection widgets for a button state."""
 
         bg_hex_entry = ttk.Entry(
-            parent, font=("Courier", 10), width=10, justify=tk.CENTER
+            parent, font=self.hex_entry_font, width=10, justify=tk.CENTER
         )
         bg_hex_var = tk.StringVar()
         bg_hex_entry.config(textvariable=bg_hex_var)
         bg_hex_entry.grid(row=row, column=1, padx=5)
-        bg_hex_entry.bind(
-            "<Return>",
-            lambda _, s=state_key, t="background": self.update_color_from_hex_entry(
-                s, t
-            ),
-        )
-        bg_hex_entry.bind(
-            "<FocusOut>",
-            lambda _, s=state_key, t="background": self.update_color_from_hex_entry(
-                s, t
-            ),
-        )
+        bg_hex_entry.bind("<Return>", self._on_color_entry_commit)
+        bg_hex_entry.bind("<FocusOut>", self._on_color_entry_commit)
+        self._color_entry_targets[bg_hex_entry] = (state_key, "background")
 
         fg_hex_entry = ttk.Entry(
-            parent, font=("Courier", 10), width=10, justify=tk.CENTER
+            parent, font=self.hex_entry_font, width=10, justify=tk.CENTER
         )
         fg_hex_var = tk.StringVar()
         fg_hex_entry.config(textvariable=fg_hex_var)
         fg_hex_entry.grid(row=row, column=3, padx=5)
-        fg_hex_entry.bind(
-            "<Return>",
-            lambda _, s=state_key, t="foreground": self.update_color_from_hex_entry(
-                s, t
-            ),
-        )
-        fg_hex_entry.bind(
-            "<FocusOut>",
-            lambda _, s=state_key, t="foreground": self.update_color_from_hex_entry(
-                s, t
-            ),
-        )
+        fg_hex_entry.bind("<Return>", self._on_color_entry_commit)
+        fg_hex_entry.bind("<FocusOut>", self._on_color_entry_commit)
+        self._color_entry_targets[fg_hex_entry] = (state_key, "foreground")
 
         bg_compliance = ttk.Label(
-            parent, text="", font=("Courier", 10, "bold"), anchor="center"
+            parent, text="", font=self.compliance_font, anchor="center"
         )
         bg_compliance.grid(row=row, column=5, sticky=tk.W, padx=5)
         fg_compliance = ttk.Label(
-            parent, text="", font=("Courier", 10, "bold"), anchor="center"
+            parent, text="", font=self.compliance_font, anchor="center"
         )
         fg_compliance.grid(row=row, column=6, sticky=tk.W, padx=5)
 
@@ -495,7 +666,7 @@ class WCAGCheckerApp:
     def _create_preview_area(self, parent):
         """Creates the application preview area with placeholder buttons."""
 
-        ttk.Label(parent, text="Application Preview", font=("Arial", 12, "bold")).grid(
+        ttk.Label(parent, text="Application Preview", font=self.heading_font).grid(
             row=0, column=0, sticky=tk.W
         )
         preview_container = tk.Frame(parent)
@@ -520,9 +691,12 @@ class WCAGCheckerApp:
 
         self.preview_button_elements = {}
         for i, (state_key, desc) in enumerate(self.button_state_definitions):
+            # Only the colors change afterwards, in refresh_all_displays
             button = tk.Button(
                 self.preview_buttons_container,
                 text=desc,
+                relief="raised",
+                font=self.preview_button_font,
                 cursor="hand2",
                 width=24,
                 height=3,
@@ -588,59 +762,66 @@ class WCAGCheckerApp:
         """Generates a PIL Image containing the web safe colors palette."""
 
         num_colors = len(self.balanced_colors)
-        rows = (num_colors + self.SWATCH_COLUMNS - 1) // self.SWATCH_COLUMNS
+        rows = self.palette_rows
 
-        # Calculate image dimensions
-        image_width = self.SWATCH_COLUMNS * self.SWATCH_WIDTH
-        image_height = rows * self.SWATCH_WIDTH
+        # One pixel per swatch, with a white padded last row if not full
+        pixels = bytearray(b"\xff" * (rows * self.SWATCH_COLUMNS * 3))
+        pixels[: num_colors * 3] = bytes(
+            channel for color_rgb in self.balanced_colors_rgb for channel in color_rgb
+        )
+        image = Image.frombytes("RGB", (self.SWATCH_COLUMNS, rows), bytes(pixels))
 
-        image = Image.new("RGB", (image_width, image_height), "#FFFFFF")
-        draw = ImageDraw.Draw(image)
+        # Scale every pixel up to a solid swatch
+        return image.resize(
+            (self.palette_width, self.palette_height), Image.Resampling.NEAREST
+        )
 
-        for i, color_hex in enumerate(self.balanced_colors):
-            row = i // self.SWATCH_COLUMNS
-            col = i % self.SWATCH_COLUMNS
-            x1 = col * self.SWATCH_WIDTH
-            y1 = row * self.SWATCH_WIDTH
-            x2 = x1 + self.SWATCH_WIDTH
-            y2 = y1 + self.SWATCH_WIDTH
-            draw.rectangle([x1, y1, x2, y2], fill=color_hex)
+    def _resize_palette_image(self, _event=None):
+        """Schedules a palette resize, so that a burst of <Configure> events
+        while the window is dragged ends in a single resize."""
 
-        return image
+        if self._resize_after_id is not None:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(
+            self.RESIZE_DELAY_MS, self._do_resize_palette
+        )
 
-    def _resize_palette_image(self, _event=None):
+    def _do_resize_palette(self):
         """Resizes the palette image to fit the label width while maintaining aspect ratio."""
 
-        if self._resizing:
-            return
-        self._resizing = True
-        try:
-            if not hasattr(self, "palette_image_pil") or not self.palette_image_pil:
-                return
-
-            new_width = self.palette_image_label.winfo_width()
+        self._resize_after_id = None
 
-            if new_width <= 1:
-                return
+        if not hasattr(self, "palette_image_pil") or not self.palette_image_pil:
+            return
 
-            original_width, original_height = self.palette_image_pil.size
+        new_width = self.palette_image_label.winfo_width()
 
-            if original_width == 0:
-                return
+        # Ignore the placeholder width and changes too small to notice
+        if new_width <= 1 or abs(new_width - self._palette_display_width) < 4:
+            return
 
-            aspect_ratio = original_height / original_width
-            new_height = int(new_width * aspect_ratio)
+        new_height = new_width * self.palette_height // self.palette_width
 
-            if new_height <= 0:
-                return
+        if new_height <= 0:
+            return
 
+        # Reuse the image of a recent width, e.g. when a resize is undone
+        cache = self._resized_palette_cache
+        palette_image_tk = cache.get(new_width)
+        if palette_image_tk is None:
             resized_image = self.palette_image_pil.resize(
                 (new_width, new_height), Image.Resampling.LANCZOS
             )
-            self.palette_image_tk = ImageTk.PhotoImage(resized_image)
-            self.palette_image_label.config(image=self.palette_image_tk)
-        finally:
-            self._resizing = False
+            palette_image_tk = ImageTk.PhotoImage(resized_image)
+            cache[new_width] = palette_image_tk
+            if len(cache) > self.RESIZE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(new_width)
+
+        self.palette_image_tk = palette_image_tk
+        self.palette_image_label.config(image=self.palette_image_tk)
+        self._palette_display_width = new_width
 
     def _on_palette_click(self, event):
         """Handles clicks on the color palette to select a color."""
@@ -648,30 +829,15 @@ class WCAGCheckerApp:
         focused_widget = self.root.focus_get()
 
         # Check if the focused widget is one of our color entries
-        is_color_entry = False
-        if focused_widget == self.app_background_hex_entry:
-            is_color_entry = True
-        else:
-            for state_key in self.state_ui_elements:
-                if focused_widget in (
-                    self.state_ui_elements[state_key]["background_hex_entry"],
-                    self.state_ui_elements[state_key]["foreground_hex_entry"],
-                ):
-                    is_color_entry = True
-                    break
+        is_app_background_entry = focused_widget == self.app_background_hex_entry
+        entry_target = self._color_entry_targets.get(focused_widget)
 
-        if not is_color_entry:
+        if not is_app_background_entry and entry_target is None:
             return  # Do nothing if a color entry is not focused
 
         # Calculate clicked color
-        label_width = self.palette_image_label.winfo_width()
-        original_width, original_height = self.palette_image_pil.size
-
-        if original_width == 0:
-            return
-
-        aspect_ratio = original_height / original_width
-        label_height = int(label_width * aspect_ratio)
+        label_width = self._palette_display_width
+        label_height = label_width * self.palette_height // self.palette_width
 
         # Click coordinates relative to the resized image
         x, y = event.x, event.y
@@ -680,14 +846,10 @@ class WCAGCheckerApp:
         if not (0 <= x < label_width and 0 <= y < label_height):
             return
 
-        scale_x = label_width / original_width
-        scale_y = label_height / original_height
-
-        orig_x = x / scale_x
-        orig_y = y / scale_y
-
-        col = int(orig_x // self.SWATCH_WIDTH)
-        row = int(orig_y // self.SWATCH_WIDTH)  # SWATCH_WIDTH is used for height too
+        # Exact integer scaling, so clicks near a swatch edge cannot land in
+        # the neighbouring swatch through float rounding
+        col = x * self.SWATCH_COLUMNS // label_width
+        row = y * self.palette_rows // label_height
 
         color_index = row * self.SWATCH_COLUMNS + col
 
@@ -695,19 +857,15 @@ class WCAGCheckerApp:
             hex_color = self.balanced_colors[color_index]
 
             # Now update the focused entry
-            if focused_widget == self.app_background_hex_entry:
+            if is_app_background_entry:
                 self.app_background_hex_var.set(hex_color)
                 self.update_app_background_from_hex_entry(None)
             else:
-                for state_key, ui_elements in self.state_ui_elements.items():
-                    if focused_widget == ui_elements["background_hex_entry"]:
-                        ui_elements["background_hex_var"].set(hex_color)
-                        self.update_color_from_hex_entry(state_key, "background")
-                        break
-                    elif focused_widget == ui_elements["foreground_hex_entry"]:
-                        ui_elements["foreground_hex_var"].set(hex_color)
-                        self.update_color_from_hex_entry(state_key, "foreground")
-                        break
+                state_key, color_type = entry_target
+                self.state_ui_elements[state_key][f"{color_type}_hex_var"].set(
+                    hex_color
+                )
+                self.update_color_from_hex_entry(state_key, color_type)
 
     # =========================================================================
     # COLOR INPUT AND SELECTION HANDLERS
@@ -717,18 +875,23 @@ class WCAGCheckerApp:
         """Updates the app background color from the hex entry field."""
 
         new_hex_color = self.app_background_hex_var.get()
-        try:
-            # Validate hex color
-            self.hex_to_rgb(new_hex_color)
-            self.app_background_color = new_hex_color
-            self.refresh_all_displays()
-            self._update_compliance_indicators()
-        except ValueError:
+        if not is_valid_hex_color(new_hex_color):
             # Restore original color if invalid
             self.app_background_hex_var.set(self.app_background_color)
             messagebox.showerror(
                 "Invalid Color", f"'{new_hex_color}' is not a valid hex color."
             )
+            return
+
+        self._set_app_background_color(new_hex_color)
+        self.refresh_all_displays()
+        self._update_compliance_indicators()
+
+    def _on_color_entry_commit(self, event):
+        """Dispatches a Return or FocusOut on a state color entry."""
+
+        state_key, color_type = self._color_entry_targets[event.widget]
+        self.update_color_from_hex_entry(state_key, color_type)
 
     def update_color_from_hex_entry(self, state_key: str, color_type: str):
         """Updates the color from a hex entry field."""
@@ -736,19 +899,18 @@ class WCAGCheckerApp:
         ui_elements = self.state_ui_elements[state_key]
         hex_var = ui_elements[f"{color_type}_hex_var"]
         new_hex_color = hex_var.get()
-        try:
-            # Validate hex color
-            self.hex_to_rgb(new_hex_color)
-            self.state_color_settings[state_key][color_type] = new_hex_color
-            self.refresh_all_displays()
-            self._update_compliance_indicators()
-        except ValueError:
+        if not is_valid_hex_color(new_hex_color):
             # Restore original color if invalid
             original_color = self.state_color_settings[state_key][color_type]
             hex_var.set(original_color)
             messagebox.showerror(
                 "Invalid Color", f"'{new_hex_color}' is not a valid hex color."
             )
+            return
+
+        self._set_state_color(state_key, color_type, new_hex_color)
+        self._refresh_state(state_key)
+        self._update_compliance_indicators()
 
     def select_app_background(self):
         """Opens a color chooser to select the application background color."""
@@ -758,8 +920,10 @@ class WCAGCheckerApp:
             title="Choose Application Background Color",
         )
         if color[1]:
-            self.app_background_color = color[1]
-            self.refresh_all_displays()
+            # Every state's background ratio depends on the app background
+            self._set_app_background_color(color[1])
+            self._refresh_app_background()
+            self._update_compliance_indicators()
 
     def select_button_color(self, state_key: str, color_type: str):
         """Opens a color chooser for a button's background or foreground color."""
@@ -770,8 +934,10 @@ class WCAGCheckerApp:
             title=f"Choose {state_key} Button {color_type.title()}",
         )
         if color[1]:
-            self.state_color_settings[state_key][color_type] = color[1]
-            self.refresh_all_displays()
+            # Only this state's widgets and indicators depend on the color
+            self._set_state_color(state_key, color_type, color[1])
+            self._refresh_state(state_key)
+            self._update_state_compliance(state_key, self.app_background_rgb)
 
     # =========================================================================
     # CORE WCAG COMPLIANCE LOGIC
@@ -796,73 +962,115 @@ class WCAGCheckerApp:
         target_color: Tuple[int, int, int],
         reference_color: Tuple[int, int, int],
         minimum_ratio: float = 4.5,
-        max_iterations: int = 100,  # Increased iterations for robustness
+        max_iterations: int = 20,
     ) -> Tuple[Tuple[int, int, int], float]:
         """Adjusts a color to meet a minimum contrast ratio against another
         color using HSL lightness adjustment.
 
         Prioritizes moving lightness away from the reference color's
-        lightness.
+        lightness, unless only the other side can reach the minimum ratio,
+        and searches for the smallest lightness change that complies with
+        false position (Illinois variant) between the starting lightness
+        and the lightness extreme of that side.
         """
 
-        # Keep adjusted_hsl as a tuple, to avoid type checker confusion
         adjusted_h, adjusted_s, adjusted_l = self._rgb_to_hsl(target_color)
 
         reference_luminance = calculate_luminance(reference_color)
 
-        best_color = target_color
-        best_contrast = calculate_contrast_ratio(target_color, reference_color)
-
-        if best_contrast >= minimum_ratio:
-            return best_color, best_contrast
+        target_contrast = calculate_contrast_ratio(target_color, reference_color)
 
-        # Initial direction: move lightness of target color away from
-        # the reference color's lightness.
-        target_luminance = calculate_luminance(
-            self._hsl_to_rgb((adjusted_h, adjusted_s, adjusted_l))
-        )  # Use current HSL
-        lightness_adjustment_step = 0.02  # Smaller step for finer control
+        if target_contrast >= minimum_ratio:
+            return target_color, target_contrast
 
-        if target_luminance > reference_luminance:  # Target is lighter, make it darker
-            lightness_adjustment_step = -lightness_adjustment_step
-        else:  # Target is darker, make it lighter
-            lightness_adjustment_step = lightness_adjustment_step
+        # Solve the contrast ratio formula for the luminance needed on either
+        # side of the reference: black and white are the extremes, so a side
+        # is reachable only if its extreme meets the minimum ratio.
+        can_darken = (reference_luminance + 0.05) / minimum_ratio - 0.05 >= 0.0
+        can_lighten = (reference_luminance + 0.05) * minimum_ratio - 0.05 <= 1.0
 
-        for iteration in range(max_iterations):
-            previous_contrast = calculate_contrast_ratio(
-                self._hsl_to_rgb((adjusted_h, adjusted_s, adjusted_l)), reference_color
-            )
+        if calculate_luminance(target_color) > reference_luminance:
+            make_lighter = can_lighten or not can_darken
+        else:
+            make_lighter = can_lighten and not can_darken
+
+        # The lightness extreme gives the highest contrast on that side
+        compliant_l = 1.0 if make_lighter else 0.0
+        best_color = self._hsl_to_rgb((adjusted_h, adjusted_s, compliant_l))
+        best_contrast = calculate_contrast_ratio(best_color, reference_color)
+
+        # Near the ratio limit the extreme can still fall just short, so the
+        # other side is tried when it is feasible too
+        if best_contrast < minimum_ratio and (
+            can_darken if make_lighter else can_lighten
+        ):
+            other_l = 1.0 - compliant_l
+            other_color = self._hsl_to_rgb((adjusted_h, adjusted_s, other_l))
+            other_contrast = calculate_contrast_ratio(other_color, reference_color)
+            if other_contrast > best_contrast:
+                make_lighter = not make_lighter
+                compliant_l = other_l
+                best_color, best_contrast = other_color, other_contrast
+
+        if best_contrast < minimum_ratio:
+            # Unreachable: return whichever of the two contrasts more
+            if best_contrast > target_contrast:
+                return best_color, best_contrast
+            return target_color, target_contrast
 
-            new_lightness = adjusted_l + lightness_adjustment_step
-            new_lightness = max(0.0, min(1.0, new_lightness))  # Clamp
+        # Compliance on the chosen side is a bound on the candidate luminance.
+        # log(luminance + 0.05) is linear in log contrast, which makes it a
+        # nearly straight function of lightness to interpolate on.
+        if make_lighter:
+            luminance_bound = (reference_luminance + 0.05) * minimum_ratio - 0.05
+        else:
+            luminance_bound = (reference_luminance + 0.05) / minimum_ratio - 0.05
+        log_bound = math.log(luminance_bound + 0.05)
+
+        failing_l = adjusted_l
+        compliant_y = math.log(calculate_luminance(best_color) + 0.05) - log_bound
+        failing_y = math.log(calculate_luminance(target_color) + 0.05) - log_bound
+        last_kept = None
+
+        # Luminance only grows with lightness, so compliance on the chosen
+        # side is monotonic between the failing and the compliant lightness:
+        # use false position with the Illinois fix against stalled endpoints
+        for _ in range(max_iterations):
+            if abs(compliant_l - failing_l) < 0.001:
+                break
+
+            middle_l = (compliant_l + failing_l) / 2
+            if compliant_y != failing_y:
+                estimate_l = compliant_l - compliant_y * (compliant_l - failing_l) / (
+                    compliant_y - failing_y
+                )
+                if (
+                    min(compliant_l, failing_l)
+                    < estimate_l
+                    < max(compliant_l, failing_l)
+                ):
+                    middle_l = estimate_l
 
-            adjusted_l = new_lightness  # Update adjusted_l
-            candidate_rgb = self._hsl_to_rgb(
-                (adjusted_h, adjusted_s, adjusted_l)
-            )  # Pass the explicit tuple
+            candidate_rgb = self._hsl_to_rgb((adjusted_h, adjusted_s, middle_l))
+            candidate_luminance = calculate_luminance(candidate_rgb)
             current_contrast = calculate_contrast_ratio(candidate_rgb, reference_color)
+            middle_y = math.log(candidate_luminance + 0.05) - log_bound
 
-            if current_contrast > best_contrast:
-                best_contrast = current_contrast
-                best_color = candidate_rgb
-
-            if current_contrast >= minimum_ratio:
-                return best_color, best_contrast
-
-            # If we hit a lightness boundary or contrast starts to
-            # decrease, reverse direction.
             if (
-                (new_lightness == 0.0 and lightness_adjustment_step < 0)
-                or (new_lightness == 1.0 and lightness_adjustment_step > 0)
-                or (current_contrast < previous_contrast and iteration > 0)
+                current_contrast >= minimum_ratio
+                and (candidate_luminance > reference_luminance) == make_lighter
             ):
-                lightness_adjustment_step = (
-                    -lightness_adjustment_step
-                )  # Reverse direction
-                # If we reversed and are not compliant, and the step is
-                # very small, we might be stuck.
-                if abs(lightness_adjustment_step) < 0.001:
-                    break
+                compliant_l, compliant_y = middle_l, middle_y
+                best_color = candidate_rgb
+                best_contrast = current_contrast
+                if last_kept == "failing":
+                    failing_y /= 2
+                last_kept = "failing"
+            else:
+                failing_l, failing_y = middle_l, middle_y
+                if last_kept == "compliant":
+                    compliant_y /= 2
+                last_kept = "compliant"
 
         return best_color, best_contrast
 
@@ -874,16 +1082,17 @@ class WCAGCheckerApp:
     ) -> Tuple[Tuple[int, int, int], float]:
         """Finds a compliant foreground color for a given background."""
 
-        high_contrast_colors = [
-            "#FFFFFF",
-            "#000000",
-        ]
+        # White and black have luminance 1 and 0, and are always the lighter
+        # and the darker color of the pair, so each ratio is one division
+        background_term = calculate_luminance(background_color) + 0.05
+
+        white_contrast = 1.05 / background_term
+        if white_contrast >= minimum_ratio:
+            return WHITE_RGB, white_contrast
 
-        for test_color_hex in high_contrast_colors:
-            test_color_rgb = self.hex_to_rgb(test_color_hex)
-            contrast = calculate_contrast_ratio(test_color_rgb, background_color)
-            if contrast >= minimum_ratio:
-                return test_color_rgb, contrast
+        black_contrast = background_term / 0.05
+        if black_contrast >= minimum_ratio:
+            return BLACK_RGB, black_contrast
 
         return self.adjust_color_for_contrast(
             current_foreground_color, background_color, minimum_ratio
@@ -893,50 +1102,47 @@ class WCAGCheckerApp:
         """Corrects the colors for a given state to meet compliance."""
 
         fixes_applied = 0
-        background_color = self.state_color_settings[state_key]["background"]
-        foreground_color = self.state_color_settings[state_key]["foreground"]
+        colors_rgb = self.state_color_rgb[state_key]
+        background_rgb = colors_rgb["background"]
+        foreground_rgb = colors_rgb["foreground"]
+        app_background_rgb = self.app_background_rgb
 
         fg_bg_compliant, _ = self.check_contrast_compliance(
-            self.hex_to_rgb(foreground_color), self.hex_to_rgb(background_color), ""
+            foreground_rgb, background_rgb, ""
         )
         if not fg_bg_compliant:
-            new_foreground_rgb, _ = self.find_suitable_foreground_color(
-                self.hex_to_rgb(background_color), self.hex_to_rgb(foreground_color)
+            foreground_rgb, _ = self.find_suitable_foreground_color(
+                background_rgb, foreground_rgb
             )
-            self.state_color_settings[state_key]["foreground"] = self.rgb_to_hex(
-                new_foreground_rgb
-            )
-            foreground_color = self.rgb_to_hex(new_foreground_rgb)
             fixes_applied += 1
 
         app_bg_compliant, _ = self.check_contrast_compliance(
-            self.hex_to_rgb(self.app_background_color),
-            self.hex_to_rgb(background_color),
-            "",
+            app_background_rgb, background_rgb, ""
         )
         if not app_bg_compliant:
-            new_background_rgb, _ = self.adjust_color_for_contrast(
-                self.hex_to_rgb(background_color),
-                self.hex_to_rgb(self.app_background_color),
+            background_rgb, _ = self.adjust_color_for_contrast(
+                background_rgb, app_background_rgb
             )
-            self.state_color_settings[state_key]["background"] = self.rgb_to_hex(
-                new_background_rgb
-            )
-            background_color = self.rgb_to_hex(new_background_rgb)
             fixes_applied += 1
 
             fg_bg_compliant_after_fix, _ = self.check_contrast_compliance(
-                self.hex_to_rgb(foreground_color), self.hex_to_rgb(background_color), ""
+                foreground_rgb, background_rgb, ""
             )
             if not fg_bg_compliant_after_fix:
-                new_foreground_after_fix_rgb, _ = self.find_suitable_foreground_color(
-                    self.hex_to_rgb(background_color),
-                    self.hex_to_rgb(foreground_color),
-                )
-                self.state_color_settings[state_key]["foreground"] = self.rgb_to_hex(
-                    new_foreground_after_fix_rgb
+                foreground_rgb, _ = self.find_suitable_foreground_color(
+                    background_rgb, foreground_rgb
                 )
                 fixes_applied += 1
+
+        # Write back only the colors that were corrected
+        if background_rgb != colors_rgb["background"]:
+            self._set_state_color(
+                state_key, "background", self.rgb_to_hex(background_rgb)
+            )
+        if foreground_rgb != colors_rgb["foreground"]:
+            self._set_state_color(
+                state_key, "foreground", self.rgb_to_hex(foreground_rgb)
+            )
         return fixes_applied
 
     # =========================================================================
@@ -946,89 +1152,104 @@ class WCAGCheckerApp:
     def refresh_all_displays(self):
         """Refreshes all UI elements with the current color settings."""
 
+        self._refresh_app_background()
+        for state_key in self._state_display_widgets:
+            self._refresh_state(state_key)
+
+    def _refresh_app_background(self):
+        """Refreshes the UI elements showing the application background."""
+
         self.app_background_hex_var.set(self.app_background_color)
 
         preview_hex = self.app_background_color
+        if self._preview_colors_shown.get(None) == preview_hex:
+            return
         self.preview_display_frame.configure(bg=preview_hex)
         self.preview_buttons_container.configure(bg=preview_hex)
-        self.preview_buttons_container.grid_columnconfigure(0, weight=1)
+        self._preview_colors_shown[None] = preview_hex
 
-        for state_key, ui_elements in self.state_ui_elements.items():
-            background_color = self.state_color_settings[state_key]["background"]
-            foreground_color = self.state_color_settings[state_key]["foreground"]
+    def _refresh_state(self, state_key: str):
+        """Refreshes the hex entries and preview button of a single state."""
 
-            ui_elements["background_hex_var"].set(background_color)
-            ui_elements["foreground_hex_var"].set(foreground_color)
+        background_hex_var, foreground_hex_var, preview_button = (
+            self._state_display_widgets[state_key]
+        )
+        colors = self.state_color_settings[state_key]
+        background_color = colors["background"]
+        foreground_color = colors["foreground"]
 
-            preview_button = self.preview_button_elements[state_key]
-            preview_button.configure(
-                bg=background_color,
-                fg=foreground_color,
-                activebackground=background_color,
-                activeforeground=foreground_color,
-                relief="raised",
-                font=("Arial", 11),
-                text=self.state_descriptions[state_key],
-            )
+        # The entries are always reset, since typing can leave them out of
+        # step, but the preview button only changes when its colors do
+        background_hex_var.set(background_color)
+        foreground_hex_var.set(foreground_color)
+
+        shown_colors = (background_color, foreground_color)
+        if self._preview_colors_shown.get(state_key) == shown_colors:
+            return
+        preview_button.configure(
+            bg=background_color,
+            fg=foreground_color,
+            activebackground=background_color,
+            activeforeground=foreground_color,
+        )
+        self._preview_colors_shown[state_key] = shown_colors
 
     def update_compliance_display(
         self, label: ttk.Label, is_compliant: bool, ratio: float
     ):
         """Updates a label to display compliance status and contrast ratio."""
 
-        if is_compliant:
-            label.config(
-                text=f"{ratio:7.2f}:1",
-                foreground="green",
-                anchor="center",
-                font=("Courier", 10, "bold"),
-            )
-        else:
-            label.config(
-                text=f"{ratio:7.2f}:1",
-                foreground="red",
-                anchor="center",
-                font=("Courier", 10, "bold"),
-            )
+        # Font and anchor are set once when the label is created, and the
+        # Tk call is skipped when the label already shows this state
+        label_state = (f"{ratio:7.2f}:1", "green" if is_compliant else "red")
+        if self._compliance_label_state.get(label) == label_state:
+            return
+        label.config(text=label_state[0], foreground=label_state[1])
+        self._compliance_label_state[label] = label_state
 
     def _update_compliance_indicators(self) -> bool:
         """Checks all color combinations and updates the compliance indicators."""
 
         all_compliant = True
-        # Check foreground-background contrast for each button state
-        for state_key, description in self.button_state_definitions:
-            background_color = self.state_color_settings[state_key]["background"]
-            foreground_color = self.state_color_settings[state_key]["foreground"]
-            is_compliant, ratio = self.check_contrast_compliance(
-                self.hex_to_rgb(foreground_color),
-                self.hex_to_rgb(background_color),
-                f"{description} Button",
-            )
-            self.update_compliance_display(
-                self.state_ui_elements[state_key]["foreground_compliance_label"],
-                is_compliant,
-                ratio,
-            )
-            if not is_compliant:
-                all_compliant = False
+        app_background_rgb = self.app_background_rgb
+        update_state_compliance = self._update_state_compliance
 
-        # Check button background against application background contrast
-        for state_key, description in self.button_state_definitions:
-            button_background = self.state_color_settings[state_key]["background"]
-            is_compliant, ratio = self.check_contrast_compliance(
-                self.hex_to_rgb(self.app_background_color),
-                self.hex_to_rgb(button_background),
-                f"App BG vs {description} Button BG",
-            )
-            self.update_compliance_display(
-                self.state_ui_elements[state_key]["background_compliance_label"],
-                is_compliant,
-                ratio,
-            )
-            if not is_compliant:
+        for state_key in self._state_compliance_widgets:
+            if not update_state_compliance(state_key, app_background_rgb):
                 all_compliant = False
         return all_compliant
 
+    def _update_state_compliance(
+        self, state_key: str, app_background_rgb: Tuple[int, int, int]
+    ) -> bool:
+        """Checks the colors of a single state and updates its indicators."""
+
+        (
+            foreground_element_name,
+            background_element_name,
+            foreground_compliance_label,
+            background_compliance_label,
+        ) = self._state_compliance_widgets[state_key]
+        colors_rgb = self.state_color_rgb[state_key]
+
+        # Check foreground-background contrast of the button
+        fg_compliant, ratio = self.check_contrast_compliance(
+            colors_rgb["foreground"],
+            colors_rgb["background"],
+            foreground_element_name,
+        )
+        self.update_compliance_display(foreground_compliance_label, fg_compliant, ratio)
+
+        # Check button background against application background contrast
+        bg_compliant, ratio = self.check_contrast_compliance(
+            app_background_rgb,
+            colors_rgb["background"],
+            background_element_name,
+        )
+        self.update_compliance_display(background_compliance_label, bg_compliant, ratio)
+
+        return fg_compliant and bg_compliant
+
     # =========================================================================
     # CONTROL BUTTON COMMANDS AND ACTIONS
     # =========================================================================
@@ -1049,7 +1270,7 @@ class WCAGCheckerApp:
     def correct_issues(self):
         """Automatically corrects all non-compliant color combinations."""
 
-        for state_key, _ in self.button_state_definitions:
+        for state_key in self._state_keys:
             self._fix_colors_for_state(state_key)
 
         self.refresh_all_displays()
@@ -1059,18 +1280,22 @@ class WCAGCheckerApp:
     def restore_defaults(self):
         """Restores color settings to the last loaded or default values."""
 
-        self.app_background_color = self.restore_app_background_color
-        self.state_color_settings = copy.deepcopy(self.restore_state_color_settings)
+        self._set_color_settings(
+            self.restore_app_background_color,
+            self._copy_state_color_settings(self.restore_state_color_settings),
+        )
         self.refresh_all_displays()
 
         self.app_background_compliance_label.config(text="", foreground="black")
-        for state_key, _ in self.button_state_definitions:
-            self.state_ui_elements[state_key]["background_compliance_label"].config(
+        for state_key in self._state_keys:
+            ui_elements = self.state_ui_elements[state_key]
+            ui_elements["background_compliance_label"].config(
                 text="", foreground="black"
             )
-            self.state_ui_elements[state_key]["foreground_compliance_label"].config(
+            ui_elements["foreground_compliance_label"].config(
                 text="", foreground="black"
             )
+        self._compliance_label_state.clear()
 
         if self._file_loaded:
             messagebox.showinfo(
@@ -1088,44 +1313,24 @@ class WCAGCheckerApp:
         remains fixed.
         """
 
-        app_bg_rgb = self.hex_to_rgb(self.app_background_color)
-        default_button_rgb = self.hex_to_rgb(
-            self.state_color_settings["default"]["background"]
-        )
+        app_bg_rgb = self.app_background_rgb
+        default_button_rgb = self.state_color_rgb["default"]["background"]
         base_h, base_s, base_l = self._rgb_to_hsl(default_button_rgb)
 
         min_contrast_button_bg_vs_app_bg = 3.0
         min_contrast_button_bg_vs_button_fg = 8.0
 
-        # Generate random transformations for each button state
-        state_transformations = {
-            "hover": {
-                "hue_shift": random.uniform(0.02, 0.08),
-                "saturation_mult": random.uniform(1.1, 1.4),
-                "lightness_shift": random.uniform(-0.20, -0.08),
-            },
-            "focused": {
-                "hue_shift": random.uniform(0.05, 0.12),
-                "saturation_mult": random.uniform(1.05, 1.25),
-                "lightness_shift": random.uniform(0.15, 0.30),
-            },
-            "active": {
-                "hue_shift": random.uniform(-0.15, -0.05),
-                "saturation_mult": random.uniform(1.2, 1.5),
-                "lightness_shift": random.uniform(-0.35, -0.15),
-            },
-            "disabled": {
-                "hue_shift": random.uniform(-0.05, 0.05),
-                "saturation_mult": random.uniform(0.2, 0.4),
-                "lightness_shift": random.uniform(0.25, 0.45),
-            },
-        }
-
         # Generate random background colors for all states except Default
-        for state_key, transforms in state_transformations.items():
-            hue_val = (base_h + transforms["hue_shift"]) % 1.0
-            saturation_val = min(1.0, base_s * transforms["saturation_mult"])
-            lightness_val = max(0.0, min(1.0, base_l + transforms["lightness_shift"]))
+        for state_key, (
+            hue_range,
+            saturation_range,
+            lightness_range,
+        ) in self.random_state_transform_ranges.items():
+            hue_val = (base_h + random.uniform(*hue_range)) % 1.0
+            saturation_val = min(1.0, base_s * random.uniform(*saturation_range))
+            lightness_val = max(
+                0.0, min(1.0, base_l + random.uniform(*lightness_range))
+            )
 
             candidate_button_bg_rgb = self._hsl_to_rgb(
                 (hue_val, saturation_val, lightness_val)
@@ -1152,15 +1357,13 @@ class WCAGCheckerApp:
                     final_button_bg_rgb, app_bg_rgb, min_contrast_button_bg_vs_app_bg
                 )
 
-            self.state_color_settings[state_key]["background"] = self.rgb_to_hex(
-                final_button_bg_rgb
+            self._set_state_color(
+                state_key, "background", self.rgb_to_hex(final_button_bg_rgb)
             )
 
         # Generate random foreground colors with high contrast
-        for state_key in state_transformations.keys():
-            state_bg_rgb = self.hex_to_rgb(
-                self.state_color_settings[state_key]["background"]
-            )
+        for state_key in self.random_state_transform_ranges:
+            state_bg_rgb = self.state_color_rgb[state_key]["background"]
 
             # Try multiple times to find a color that meets 8:1 contrast
             for attempt in range(10):
@@ -1182,16 +1385,13 @@ class WCAGCheckerApp:
                     new_fg_rgb = candidate_fg_rgb
                     break
             else:
-                # Fallback: use pure black or white based on background lightness
-                state_bg_h, state_bg_s, state_bg_l = self._rgb_to_hsl(state_bg_rgb)
-                if state_bg_l > 0.5:
-                    new_fg_rgb = (0, 0, 0)  # Dark background -> black text
+                # Fallback: pure black or white, whichever contrasts more
+                if calculate_luminance(state_bg_rgb) > BLACK_WHITE_CROSSOVER_LUMINANCE:
+                    new_fg_rgb = BLACK_RGB
                 else:
-                    new_fg_rgb = (255, 255, 255)  # Light background -> white text
+                    new_fg_rgb = WHITE_RGB
 
-            self.state_color_settings[state_key]["foreground"] = self.rgb_to_hex(
-                new_fg_rgb
-            )
+            self._set_state_color(state_key, "foreground", self.rgb_to_hex(new_fg_rgb))
 
         self.refresh_all_displays()
         self._update_compliance_indicators()
@@ -1200,27 +1400,50 @@ class WCAGCheckerApp:
     # UTILITY METHODS
     # =========================================================================
 
+    def _set_app_background_color(self, hex_color: str):
+        """Sets the application background color, along with its parsed RGB
+        mirror."""
+
+        self.app_background_rgb = hex_to_rgb(hex_color)
+        self.app_background_color = hex_color
+
+    def _set_color_settings(self, app_background_color: str, state_settings: dict):
+        """Replaces the application background and all state colors, along
+        with their parsed RGB mirrors.
+
+        Every color is parsed first, so invalid colors raise before anything
+        is replaced.
+        """
+
+        app_background_rgb = hex_to_rgb(app_background_color)
+        state_color_rgb = {
+            state_key: {
+                "background": hex_to_rgb(colors["background"]),
+                "foreground": hex_to_rgb(colors["foreground"]),
+            }
+            for state_key, colors in state_settings.items()
+        }
+
+        self.app_background_rgb = app_background_rgb
+        self.app_background_color = app_background_color
+        self.state_color_rgb = state_color_rgb
+        self.state_color_settings = state_settings
+
+    def _set_state_color(self, state_key: str, color_type: str, hex_color: str):
+        """Sets a single state color, along with its parsed RGB mirror."""
+
+        self.state_color_rgb[state_key][color_type] = hex_to_rgb(hex_color)
+        self.state_color_settings[state_key][color_type] = hex_color
+
     def rgb_to_hex(self, color: Tuple[int, int, int]) -> str:
         """Converts an RGB color tuple to a hex string."""
 
-        return "#{:02X}{:02X}{:02X}".format(*color)
+        return rgb_to_hex(color)
 
     def hex_to_rgb(self, hex_string: str) -> Tuple[int, int, int]:
         """Converts a hex color string to an RGB tuple."""
 
-        color_string = hex_string.strip().lstrip("#")
-
-        if len(color_string) != 6:
-            raise ValueError(f"Invalid hex color length: {hex_string}")
-
-        try:
-            return (
-                int(color_string[0:2], 16),
-                int(color_string[2:4], 16),
-                int(color_string[4:6], 16),
-            )
-        except ValueError:
-            raise ValueError(f"Invalid hex color value: {hex_string}")
+        return hex_to_rgb(hex_string)
 
     def _rgb_to_hsl(self, rgb: Tuple[int, int, int]) -> Tuple[float, float, float]:
         """Converts an RGB color tuple to an HSL tuple (hue, saturation, lightness)."""
@@ -1234,13 +1457,15 @@ class WCAGCheckerApp:
 
         _h, _s, _l = hsl
         _r, _g, _b = colorsys.hls_to_rgb(_h, _l, _s)
-        return self._cast_color_list([int(c * 255) for c in (_r, _g, _b)])
+        # Rounded, since colorsys can return 0.9999999999999999 for white
+        return round(_r * 255), round(_g * 255), round(_b * 255)
 
     @staticmethod
-    def _cast_color_list(color_list: list[int]) -> Tuple[int, int, int]:
-        """Casts a list of 3 integers to a fixed-size tuple for type checking."""
+    def _copy_state_color_settings(settings: dict) -> dict:
+        """Copies per-state color settings; the hex strings are immutable, so
+        copying the two dict levels is enough."""
 
-        return cast(Tuple[int, int, int], tuple(color_list))
+        return {state_key: dict(colors) for state_key, colors in settings.items()}
 
 
 # =============================================================================